@@ -9,21 +9,27 @@ hybrid retrieval (BM25 + vector search) and LLM generation.
 import os
 import sys
 import logging
+import argparse
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
+from typing import Tuple
 
 from dotenv import load_dotenv
+from psycopg2.extensions import connection as PgConnection
+from tqdm import tqdm
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.database.db_setup import init_database, reset_database, get_stats
+from src.database.db_setup import init_database, reset_database, get_stats, get_connection, invalidate_stats
 from src.ingestion.pdf_parser import process_pdf_directory, get_pdf_count
 from src.ingestion.metadata_extractor import extract_metadata
 from src.indexing.chunker import chunk_text
-from src.indexing.embeddings import get_embeddings_batch, check_ollama_model
+from src.indexing.embeddings import EMBEDDING_BACKEND, get_embeddings_batch, check_ollama_model
+from src.indexing.embeddings_local import check_fastembed_model
 from src.indexing.vector_store import insert_article, insert_chunks
 from src.retrieval.hybrid_retriever import HybridRetriever
-from src.generation.llm_generator import generate_answer, check_llm_model
+from src.generation.llm_generator import generate_answer_stream, check_llm_model
 
 load_dotenv()
 
@@ -35,6 +41,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 PDF_DIR = Path(__file__).parent / "data" / "pdfs"
+EMBED_WORKERS = 2  # Articles chunked and embedded concurrently during ingest
+MAX_PENDING_ARTICLES = 2 * EMBED_WORKERS  # Parsed articles waiting for embedding or storage
+ARTICLES_PER_COMMIT = 8  # Articles written per transaction during ingest
 
 
 def print_banner():
@@ -44,32 +53,30 @@ def print_banner():
     print("=" * 50 + "\n")
 
 
-def print_progress(current: int, total: int, prefix: str = ""):
-    """Print a simple progress bar."""
-    bar_length = 30
-    filled = int(bar_length * current / total)
-    bar = "█" * filled + "░" * (bar_length - filled)
-    print(f"\r{prefix}[{bar}] {current}/{total}", end="", flush=True)
-    if current == total:
-        print()
-
-
-def check_prerequisites() -> bool:
-    """Check that required services are available."""
+def check_prerequisites(warmup: bool = False) -> bool:
+    """Check that required services are available (and optionally load the models)."""
     print("Checking prerequisites...")
 
     # Check embedding model
-    print("  - Checking nomic-embed-text model...", end=" ")
-    if not check_ollama_model():
-        print("FAILED")
-        print("\nError: nomic-embed-text model not available.")
-        print("Run: ollama pull nomic-embed-text")
-        return False
+    if EMBEDDING_BACKEND == "fastembed":
+        print("  - Loading fastembed model...", end=" ")
+        if not check_fastembed_model():
+            print("FAILED")
+            print("\nError: fastembed model could not be loaded.")
+            print("Run: pip install fastembed")
+            return False
+    else:
+        print("  - Checking nomic-embed-text model...", end=" ")
+        if not check_ollama_model(warmup=warmup):
+            print("FAILED")
+            print("\nError: nomic-embed-text model not available.")
+            print("Run: ollama pull nomic-embed-text")
+            return False
     print("OK")
 
     # Check LLM model
     print("  - Checking llama3 model...", end=" ")
-    if not check_llm_model():
+    if not check_llm_model(warmup=warmup):
         print("FAILED")
         print("\nError: llama3 model not available.")
         print("Run: ollama pull llama3")
@@ -91,36 +98,108 @@ def process_pdfs() -> int:
     print(f"\nProcessing {pdf_count} PDFs from {PDF_DIR}...")
 
     total_chunks = 0
-    processed = 0
+    stored = 0
+    pending = {}  # Future -> PDF filename, so failures can name the file
+
+    def store(future: Future, filename: str) -> None:
+        nonlocal total_chunks, stored
+        total_chunks += _store_article(conn, future, filename)
+        stored += 1
+        if stored % ARTICLES_PER_COMMIT == 0:
+            conn.commit()
+            invalidate_stats()
+        progress.update()
+
+    # Pipeline: parse the next PDF while earlier articles are chunked and
+    # embedded in the background; the main thread performs all database
+    # writes on one connection, committing every ARTICLES_PER_COMMIT articles.
+    # The bar counts stored articles, the last stage of the pipeline (tqdm
+    # throttles terminal redraws instead of flushing on every PDF)
+    with get_connection() as conn, \
+            ThreadPoolExecutor(max_workers=EMBED_WORKERS) as embed_pool, \
+            tqdm(total=pdf_count, desc="  PDFs") as progress:
+        for pdf_data in process_pdf_directory(str(PDF_DIR)):
+            if 'error' in pdf_data:
+                # Already logged by the parser; nothing to store
+                progress.update()
+                continue
+
+            if len(pending) >= MAX_PENDING_ARTICLES:
+                # Parsing outruns embedding: wait for a slot so texts and
+                # embeddings don't pile up in memory
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            else:
+                # Store any articles whose embeddings are already done
+                done = [future for future in pending if future.done()]
+
+            for future in done:
+                store(future, pending.pop(future))
+
+            pending[embed_pool.submit(_prepare_article, pdf_data)] = pdf_data['filename']
+
+        for future in as_completed(pending):
+            store(future, pending[future])
+
+        conn.commit()
+        invalidate_stats()
+
+    print(f"  Generated {total_chunks} chunks with embeddings")
+    return total_chunks
+
+
+def _prepare_article(pdf_data: dict) -> Tuple[dict, dict, list, list]:
+    """Extract metadata, chunk an article and generate embeddings for its chunks."""
+    metadata = extract_metadata(pdf_data['filename'], pdf_data['full_text'])
+
+    # Article ID is assigned when the article is inserted
+    chunks = chunk_text(pdf_data['full_text'], None)
+    logger.info(f"Created {len(chunks)} chunks for {pdf_data['filename']}")
+
+    if not chunks:
+        return pdf_data, metadata, [], []
 
-    for pdf_data in process_pdf_directory(str(PDF_DIR)):
-        processed += 1
-        print_progress(processed, pdf_count, "  ")
+    chunk_texts = [c['chunk_text'] for c in chunks]
+    return pdf_data, metadata, chunks, get_embeddings_batch(chunk_texts)
 
-        # Extract metadata
-        metadata = extract_metadata(pdf_data['filename'], pdf_data['full_text'])
+
+def _store_article(conn: PgConnection, future: Future, filename: str) -> int:
+    """
+    Insert an article and its chunks inside a savepoint.
+
+    A failure rolls back only this article; the rest of the batch is kept.
+    Returns the number of chunks stored.
+    """
+    cur = conn.cursor()
+    cur.execute("SAVEPOINT article;")
+
+    try:
+        pdf_data, metadata, chunks, embeddings = future.result()
 
         # Insert article
         article_id = insert_article(
             metadata,
             pdf_data['full_text'],
-            str(PDF_DIR / pdf_data['filename'])
+            str(PDF_DIR / pdf_data['filename']),
+            conn
         )
 
-        # Create chunks
-        chunks = chunk_text(pdf_data['full_text'], article_id)
-
         if chunks:
-            # Generate embeddings
-            chunk_texts = [c['chunk_text'] for c in chunks]
-            embeddings = get_embeddings_batch(chunk_texts)
+            for chunk in chunks:
+                chunk['article_id'] = article_id
 
             # Store chunks with embeddings
-            insert_chunks(article_id, chunks, embeddings)
-            total_chunks += len(chunks)
+            insert_chunks(article_id, chunks, embeddings, conn)
 
-    print(f"  Generated {total_chunks} chunks with embeddings")
-    return total_chunks
+        cur.execute("RELEASE SAVEPOINT article;")
+        return len(chunks)
+
+    except Exception as e:
+        cur.execute("ROLLBACK TO SAVEPOINT article;")
+        cur.execute("RELEASE SAVEPOINT article;")
+        logger.error(f"Skipping {filename}: {e}")
+        return 0
+    finally:
+        cur.close()
 
 
 def show_stats():
@@ -131,6 +210,19 @@ def show_stats():
     print(f"  Chunks:   {stats['chunks']}")
 
 
+def stream_answer(query: str, results: list) -> Tuple[float, list]:
+    """Print answer tokens as they arrive and return (generation time, citations)."""
+    stream = generate_answer_stream(query, results)
+
+    while True:
+        try:
+            sys.stdout.write(next(stream))
+            sys.stdout.flush()
+        except StopIteration as done:
+            print()
+            return done.value
+
+
 def query_loop(retriever: HybridRetriever):
     """Main query interaction loop."""
     print("\nReady for queries!")
@@ -171,14 +263,10 @@ def query_loop(retriever: HybridRetriever):
 
             print(f"Found {len(results)} relevant chunks ({retrieval_time:.2f}s)")
 
-            # Generate answer
-            print("[Generating...]\n")
-            answer, gen_time, citations = generate_answer(query, results)
-
-            # Display answer
-            print("Answer:")
+            # Stream the answer as it is generated
+            print("\nAnswer:")
             print("-" * 40)
-            print(answer)
+            gen_time, citations = stream_answer(query, results)
             print("-" * 40)
 
             # Display citations
@@ -206,12 +294,24 @@ def query_loop(retriever: HybridRetriever):
             print(f"\nError: {e}")
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="RAG Clinical Literature Demo")
+    parser.add_argument(
+        "--warmup",
+        action="store_true",
+        help="load the Ollama models at startup so the first query is not slowed by a cold start"
+    )
+    return parser.parse_args()
+
+
 def main():
     """Main entry point."""
+    args = parse_args()
     print_banner()
 
     # Check prerequisites
-    if not check_prerequisites():
+    if not check_prerequisites(warmup=args.warmup):
         sys.exit(1)
 
     # Initialize database
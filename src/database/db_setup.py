@@ -2,117 +2,270 @@
 
 import os
 import logging
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
 import psycopg2
-from psycopg2.extensions import connection as PgConnection
+from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.extensions import connection as PgConnection, cursor as PgCursor
+from pgvector.psycopg2 import register_vector
 from dotenv import load_dotenv
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+POOL_MIN_CONN = 1
+POOL_MAX_CONN = 16
 
-def get_connection() -> PgConnection:
-    """Create and return a PostgreSQL database connection."""
-    return psycopg2.connect(
-        host=os.getenv("DB_HOST", "localhost"),
-        port=os.getenv("DB_PORT", "5432"),
-        dbname=os.getenv("DB_NAME", "rag_clinical"),
-        user=os.getenv("DB_USER", "postgres"),
-        password=os.getenv("DB_PASSWORD", "password")
-    )
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
 
+_stats_cache: Optional[dict] = None  # Row counts, cleared on every write
+
+
+class _PooledConnection(PgConnection):
+    """Connection that remembers per-session setup across pool checkouts."""
+
+    vector_registered = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
 
-def init_database() -> None:
-    """Initialize database with required tables and extensions."""
-    conn = get_connection()
-    cur = conn.cursor()
+
+def _get_pool() -> ThreadedConnectionPool:
+    """Create the shared connection pool on first use."""
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(
+                    POOL_MIN_CONN,
+                    POOL_MAX_CONN,
+                    host=os.getenv("DB_HOST", "localhost"),
+                    port=os.getenv("DB_PORT", "5432"),
+                    dbname=os.getenv("DB_NAME", "rag_clinical"),
+                    user=os.getenv("DB_USER", "postgres"),
+                    password=os.getenv("DB_PASSWORD", "password"),
+                    connection_factory=_PooledConnection
+                )
+                logger.info("Database connection pool created")
+
+    return _pool
+
+
+@contextmanager
+def get_connection() -> Iterator[PgConnection]:
+    """Check out a pooled PostgreSQL connection for the duration of the block."""
+    pool = _get_pool()
+    conn = pool.getconn()
 
     try:
-        # Enable pgvector extension
-        cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
-        logger.info("pgvector extension enabled")
-
-        # Create articles table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS articles (
-                id SERIAL PRIMARY KEY,
-                title VARCHAR(500),
-                authors TEXT,
-                journal VARCHAR(300),
-                year INTEGER,
-                pdf_path VARCHAR(500),
-                full_text TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-        logger.info("Articles table created")
-
-        # Create chunks table with vector embedding
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS chunks (
-                id SERIAL PRIMARY KEY,
-                article_id INTEGER REFERENCES articles(id) ON DELETE CASCADE,
-                chunk_text TEXT NOT NULL,
-                chunk_index INTEGER NOT NULL,
-                embedding vector(768),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-        logger.info("Chunks table created")
-
-        # Create vector similarity index for fast retrieval
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS chunks_embedding_idx
-            ON chunks USING ivfflat (embedding vector_cosine_ops)
-            WITH (lists = 100);
-        """)
-        logger.info("Vector similarity index created")
-
-        conn.commit()
-        logger.info("Database initialization complete")
-
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Database initialization failed: {e}")
-        raise
+        _register_vector(conn)
+        yield conn
     finally:
-        cur.close()
-        conn.close()
+        if conn.closed:
+            pool.putconn(conn, close=True)
+        else:
+            # Never hand an open transaction back to the pool
+            conn.rollback()
+            pool.putconn(conn)
 
 
-def reset_database() -> None:
-    """Drop and recreate all tables (for reindexing)."""
-    conn = get_connection()
-    cur = conn.cursor()
+def prepare_statement(conn: _PooledConnection, name: str, sql: str) -> None:
+    """
+    Prepare a named statement once per session so later EXECUTEs skip parse and plan.
+
+    Args:
+        conn: Pooled connection the statement is prepared on
+        name: Statement name used with EXECUTE
+        sql: Statement body using $1, $2, ... placeholders
+    """
+    if name in conn.prepared_statements:
+        return
 
+    cur = conn.cursor()
     try:
-        cur.execute("DROP TABLE IF EXISTS chunks CASCADE;")
-        cur.execute("DROP TABLE IF EXISTS articles CASCADE;")
-        conn.commit()
-        logger.info("Tables dropped")
+        cur.execute(f"PREPARE {name} AS {sql}")
+        conn.prepared_statements.add(name)
     finally:
         cur.close()
-        conn.close()
+
+
+def _register_vector(conn: _PooledConnection) -> None:
+    """Let psycopg2 pass numpy arrays as pgvector values on this connection."""
+    if conn.vector_registered:
+        return
+
+    try:
+        register_vector(conn)
+        conn.vector_registered = True
+    except psycopg2.ProgrammingError:
+        # Extension not created yet (init_database does that); retry next checkout
+        conn.rollback()
+
+
+def init_database() -> None:
+    """Initialize database with required tables and extensions."""
+    with get_connection() as conn:
+        cur = conn.cursor()
+
+        try:
+            # Enable pgvector extension
+            cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+            logger.info("pgvector extension enabled")
+
+            # Create articles table
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    id SERIAL PRIMARY KEY,
+                    title VARCHAR(500),
+                    authors TEXT,
+                    journal VARCHAR(300),
+                    year INTEGER,
+                    pdf_path VARCHAR(500),
+                    full_text TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+            logger.info("Articles table created")
+
+            # Create chunks table with half-precision embedding and its binary quantization
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    id SERIAL PRIMARY KEY,
+                    article_id INTEGER REFERENCES articles(id) ON DELETE CASCADE,
+                    chunk_text TEXT NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    embedding halfvec(768),
+                    embedding_bin bit(768) GENERATED ALWAYS AS (binary_quantize(embedding)::bit(768)) STORED,
+                    ts TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', chunk_text)) STORED,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+            _migrate_chunks_table(cur)
+            logger.info("Chunks table created")
+
+            # Create HNSW vector similarity index (no training step, unlike IVFFlat).
+            # Embeddings are unit length, so inner product ranks like cosine
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS chunks_embedding_idx
+                ON chunks USING hnsw (embedding halfvec_ip_ops)
+                WITH (m = 16, ef_construction = 64);
+            """)
+            logger.info("Vector similarity index created")
+
+            # Create Hamming-distance index used to pre-filter candidates
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS chunks_embedding_bin_idx
+                ON chunks USING hnsw (embedding_bin bit_hamming_ops)
+                WITH (m = 16, ef_construction = 64);
+            """)
+            logger.info("Binary quantized index created")
+
+            # Create full-text index for server-side keyword search
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS chunks_ts_idx
+                ON chunks USING GIN (ts);
+            """)
+            logger.info("Full-text index created")
+
+            conn.commit()
+            logger.info("Database initialization complete")
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Database initialization failed: {e}")
+            raise
+        finally:
+            cur.close()
+
+
+def _migrate_chunks_table(cur: PgCursor) -> None:
+    """Bring a chunks table created by an older schema up to date."""
+    # Drop an embedding index built for another column type or distance operator
+    cur.execute("SELECT indexdef FROM pg_indexes WHERE indexname = 'chunks_embedding_idx';")
+    row = cur.fetchone()
+    if row and 'halfvec_ip_ops' not in row[0]:
+        cur.execute("DROP INDEX chunks_embedding_idx;")
+        logger.info("Dropped outdated vector similarity index")
+
+        # Inner-product ranking needs unit-length vectors; older rows were stored as returned
+        cur.execute("UPDATE chunks SET embedding = l2_normalize(embedding);")
+        logger.info(f"L2-normalized {cur.rowcount} existing chunk embeddings")
+
+    # Convert full-precision embeddings to halfvec
+    cur.execute("""
+        SELECT format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = 'chunks'::regclass AND attname = 'embedding';
+    """)
+    if cur.fetchone()[0].startswith('vector'):
+        cur.execute("ALTER TABLE chunks ALTER COLUMN embedding TYPE halfvec(768);")
+        logger.info("Converted chunk embeddings to halfvec")
+
+    cur.execute("""
+        ALTER TABLE chunks ADD COLUMN IF NOT EXISTS
+        embedding_bin bit(768) GENERATED ALWAYS AS (binary_quantize(embedding)::bit(768)) STORED;
+    """)
+    cur.execute("""
+        ALTER TABLE chunks ADD COLUMN IF NOT EXISTS
+        ts TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', chunk_text)) STORED;
+    """)
+
+
+def reset_database() -> None:
+    """Drop and recreate all tables (for reindexing)."""
+    with get_connection() as conn:
+        cur = conn.cursor()
+
+        try:
+            cur.execute("DROP TABLE IF EXISTS chunks CASCADE;")
+            cur.execute("DROP TABLE IF EXISTS articles CASCADE;")
+            conn.commit()
+            invalidate_stats()
+            logger.info("Tables dropped")
+        finally:
+            cur.close()
 
     init_database()
 
 
 def get_stats() -> dict:
-    """Get database statistics."""
-    conn = get_connection()
-    cur = conn.cursor()
+    """
+    Get database statistics.
 
-    try:
-        cur.execute("SELECT COUNT(*) FROM articles;")
-        article_count = cur.fetchone()[0]
+    Counts are exact and cached in-process until the next committed write
+    (see invalidate_stats), so repeated calls skip the scans.
+    """
+    global _stats_cache
 
-        cur.execute("SELECT COUNT(*) FROM chunks;")
-        chunk_count = cur.fetchone()[0]
+    if _stats_cache is not None:
+        return dict(_stats_cache)
 
-        return {
-            "articles": article_count,
-            "chunks": chunk_count
-        }
-    finally:
-        cur.close()
-        conn.close()
+    with get_connection() as conn:
+        cur = conn.cursor()
+
+        try:
+            prepare_statement(conn, "get_stats", """
+                SELECT
+                    (SELECT COUNT(*) FROM articles),
+                    (SELECT COUNT(*) FROM chunks)
+            """)
+            cur.execute("EXECUTE get_stats;")
+            article_count, chunk_count = cur.fetchone()
+
+            _stats_cache = {
+                "articles": article_count,
+                "chunks": chunk_count
+            }
+            return dict(_stats_cache)
+        finally:
+            cur.close()
+
+
+def invalidate_stats() -> None:
+    """Discard cached statistics; call after committing changes to articles or chunks."""
+    global _stats_cache
+    _stats_cache = None
@@ -11,6 +11,12 @@ LLM_MODEL = "llama3.2:1b"
 MAX_CONTEXT_CHARS = 2000  # Limit context size for faster generation
 MAX_CHUNK_CHARS = 600  # Limit each chunk
 
+GENERATION_OPTIONS = {
+    'temperature': 0.5,
+    'top_p': 0.9,
+    'num_predict': 256,  # Limit response length
+}
+
 PROMPT_TEMPLATE = """Answer based on the context. Cite sources as [Title, Year].
 
 Context:
@@ -62,11 +68,7 @@ def generate_answer(query: str, chunks: List[dict]) -> Tuple[str, float, List[di
         response = ollama.generate(
             model=LLM_MODEL,
             prompt=prompt,
-            options={
-                'temperature': 0.5,
-                'top_p': 0.9,
-                'num_predict': 256,  # Limit response length
-            }
+            options=GENERATION_OPTIONS
         )
 
         answer = response['response']
@@ -94,7 +96,8 @@ def generate_answer_stream(query: str, chunks: List[dict]) -> Generator[str, Non
         Answer tokens as they're generated
 
     Returns:
-        Tuple of (generation time, citations) after completion
+        Tuple of (generation time, citations) after completion; the time is
+        measured from the first request, not from the first token
     """
     start_time = time.time()
 
@@ -106,10 +109,7 @@ def generate_answer_stream(query: str, chunks: List[dict]) -> Generator[str, Non
             model=LLM_MODEL,
             prompt=prompt,
             stream=True,
-            options={
-                'temperature': 0.7,
-                'top_p': 0.9,
-            }
+            options=GENERATION_OPTIONS
         )
 
         for chunk in stream:
@@ -144,15 +144,30 @@ def extract_citations(chunks: List[dict]) -> List[dict]:
     return citations[:3]  # Top 3 citations
 
 
-def check_llm_model() -> bool:
-    """Check if the LLM model is available."""
+def check_llm_model(warmup: bool = False) -> bool:
+    """
+    Check if the LLM model is available.
+
+    Args:
+        warmup: Also run a one-token generation so the model is loaded before the first query
+
+    Returns:
+        True if the model is installed (and, with warmup, responds)
+    """
     try:
-        response = ollama.generate(
-            model=LLM_MODEL,
-            prompt="Hi",
-            options={'num_predict': 1}
-        )
-        return 'response' in response
+        # Model listing needs no inference, unlike a test generation
+        models = ollama.list()['models']
+        if not any((m.get('model') or m.get('name', '')).startswith(LLM_MODEL) for m in models):
+            return False
+
+        if warmup:
+            response = ollama.generate(
+                model=LLM_MODEL,
+                prompt="Hi",
+                options={'num_predict': 1}
+            )
+            return 'response' in response
+        return True
     except Exception as e:
         logger.error(f"LLM model check failed: {e}")
         return False
@@ -2,7 +2,8 @@
 
 import re
 import logging
-from typing import List
+from collections import deque
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -15,14 +16,22 @@ TARGET_CHARS = TARGET_TOKENS * CHARS_PER_TOKEN  # ~1200 chars
 OVERLAP_CHARS = OVERLAP_TOKENS * CHARS_PER_TOKEN
 MAX_CHUNK_CHARS = 6000  # Hard limit to stay within embedding model context
 
+# Split on whitespace after a sentence terminator, unless it ends a common abbreviation
+_ABBREVIATIONS = ('Dr', 'Mr', 'Mrs', 'Ms', 'Prof', 'et al', 'vs', 'Fig', 'fig', 'i.e', 'e.g')
+_SENTENCE_SPLIT_RE = re.compile(
+    r'(?<=[.!?])'
+    + ''.join(rf'(?<!\b{re.escape(abbr)}\.)' for abbr in _ABBREVIATIONS)
+    + r'\s+'
+)
 
-def chunk_text(text: str, article_id: int) -> List[dict]:
+
+def chunk_text(text: str, article_id: Optional[int]) -> List[dict]:
     """
     Split text into semantic chunks with overlap.
 
     Args:
         text: Full text to chunk
-        article_id: ID of the source article
+        article_id: ID of the source article (None if not inserted yet)
 
     Returns:
         List of chunk dictionaries with article_id, chunk_text, chunk_index
@@ -43,10 +52,9 @@ def chunk_text(text: str, article_id: int) -> List[dict]:
 
         # If adding this sentence exceeds target, save chunk and start new one
         if current_length + sentence_length > TARGET_CHARS and current_chunk:
-            chunk_text = ' '.join(current_chunk)
             chunks.append({
                 "article_id": article_id,
-                "chunk_text": chunk_text,
+                "chunk_text": _join_within(current_chunk, MAX_CHUNK_CHARS),
                 "chunk_index": chunk_index
             })
             chunk_index += 1
@@ -66,31 +74,24 @@ def chunk_text(text: str, article_id: int) -> List[dict]:
 
     # Don't forget the last chunk
     if current_chunk:
-        chunk_text = ' '.join(current_chunk)
-        # Truncate if still too long
-        if len(chunk_text) > MAX_CHUNK_CHARS:
-            chunk_text = chunk_text[:MAX_CHUNK_CHARS]
-        if len(chunk_text.strip()) > 50:  # Only if substantial
+        last_chunk = _join_within(current_chunk, MAX_CHUNK_CHARS)
+        if len(last_chunk.strip()) > 50:  # Only if substantial
             chunks.append({
                 "article_id": article_id,
-                "chunk_text": chunk_text,
+                "chunk_text": last_chunk,
                 "chunk_index": chunk_index
             })
 
-    logger.info(f"Created {len(chunks)} chunks for article {article_id}")
+    # Callers that chunk before the article is inserted log their own label
+    if article_id is not None:
+        logger.info(f"Created {len(chunks)} chunks for article {article_id}")
     return chunks
 
 
 def _split_into_sentences(text: str) -> List[str]:
     """Split text into sentences."""
-    # Simple sentence splitting on common terminators
-    # Handle abbreviations and decimals to avoid false splits
-    text = re.sub(r'([.!?])\s+', r'\1|SPLIT|', text)
-
-    # Don't split on common abbreviations
-    text = re.sub(r'(Dr|Mr|Mrs|Ms|Prof|et al|vs|Fig|fig|i\.e|e\.g)\|SPLIT\|', r'\1. ', text)
-
-    sentences = text.split('|SPLIT|')
+    # Single pass over the text; terminators stay attached to their sentence
+    sentences = _SENTENCE_SPLIT_RE.split(text)
 
     # Clean up sentences
     cleaned = []
@@ -104,13 +105,29 @@ def _split_into_sentences(text: str) -> List[str]:
 
 def _get_overlap(chunks: List[str], target_chars: int) -> str:
     """Get overlap text from end of chunk list."""
-    overlap_parts = []
+    overlap_parts = deque()
     total_length = 0
 
     for chunk in reversed(chunks):
-        overlap_parts.insert(0, chunk)
+        overlap_parts.appendleft(chunk)
         total_length += len(chunk)
         if total_length >= target_chars:
             break
 
     return ' '.join(overlap_parts)
+
+
+def _join_within(parts: List[str], limit: int) -> str:
+    """Join parts with spaces, truncated to limit chars without building the full string."""
+    kept = []
+    length = 0
+
+    for part in parts:
+        if kept:
+            length += 1  # Separator
+        if length >= limit:
+            break
+        kept.append(part[:limit - length])  # No copy when the part fits
+        length += len(kept[-1])
+
+    return ' '.join(kept)
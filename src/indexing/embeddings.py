@@ -1,20 +1,24 @@
-"""Embedding generation using Ollama with nomic-embed-text model."""
+"""Embedding generation using Ollama (or fastembed) with nomic-embed-text model."""
 
 import os
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 import numpy as np
 import ollama
+from .embeddings_local import get_fastembed_backend
 
 logger = logging.getLogger(__name__)
 
 EMBEDDING_MODEL = "nomic-embed-text"
 EMBEDDING_DIM = 768
-BATCH_SIZE = 10
+BATCH_SIZE = 32  # Texts per embed request
 MAX_RETRIES = 3
 RETRY_DELAY = 2
 MAX_TEXT_CHARS = 6000  # Safety limit to stay within model context
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))  # Embed requests in flight
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "ollama").lower()  # "ollama" or "fastembed"
 
 
 def get_embedding(text: str) -> np.ndarray:
@@ -27,25 +31,10 @@ def get_embedding(text: str) -> np.ndarray:
     Returns:
         Numpy array of shape (768,)
     """
-    # Truncate text if too long
-    if len(text) > MAX_TEXT_CHARS:
-        text = text[:MAX_TEXT_CHARS]
-        logger.debug(f"Truncated text to {MAX_TEXT_CHARS} chars")
+    if EMBEDDING_BACKEND == "fastembed":
+        return get_fastembed_backend().embed([text[:MAX_TEXT_CHARS]])[0]
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = ollama.embeddings(
-                model=EMBEDDING_MODEL,
-                prompt=text
-            )
-            return np.array(response['embedding'], dtype=np.float32)
-
-        except Exception as e:
-            logger.warning(f"Embedding attempt {attempt + 1} failed: {e}")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY)
-            else:
-                raise RuntimeError(f"Failed to generate embedding after {MAX_RETRIES} attempts: {e}")
+    return _embed_with_retry([text])[0]
 
 
 def get_embeddings_batch(texts: List[str]) -> List[np.ndarray]:
@@ -58,35 +47,68 @@ def get_embeddings_batch(texts: List[str]) -> List[np.ndarray]:
     Returns:
         List of numpy arrays, each of shape (768,)
     """
-    embeddings = []
+    if EMBEDDING_BACKEND == "fastembed":
+        # In-process ONNX batches; no HTTP requests to overlap
+        return get_fastembed_backend().embed([text[:MAX_TEXT_CHARS] for text in texts])
 
-    # Process in batches
-    for i in range(0, len(texts), BATCH_SIZE):
-        batch = texts[i:i + BATCH_SIZE]
-        batch_embeddings = []
+    batches = [texts[i:i + BATCH_SIZE] for i in range(0, len(texts), BATCH_SIZE)]
+    if not batches:
+        return []
 
-        for text in batch:
-            embedding = get_embedding(text)
-            batch_embeddings.append(embedding)
+    embeddings = []
+    workers = max(1, min(EMBED_CONCURRENCY, len(batches)))
 
-        embeddings.extend(batch_embeddings)
+    # Keep several embed requests in flight; map() preserves input order
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch_embeddings in executor.map(_embed_with_retry, batches):
+            embeddings.extend(batch_embeddings)
 
-        # Log progress
-        processed = min(i + BATCH_SIZE, len(texts))
-        logger.debug(f"Generated embeddings: {processed}/{len(texts)}")
+            # Log progress
+            logger.debug(f"Generated embeddings: {len(embeddings)}/{len(texts)}")
 
     return embeddings
 
 
-def check_ollama_model() -> bool:
-    """Check if the embedding model is available."""
+def check_ollama_model(warmup: bool = False) -> bool:
+    """
+    Check if the embedding model is available.
+
+    Args:
+        warmup: Also run a test embedding so the model is loaded before the first query
+
+    Returns:
+        True if the model is installed (and, with warmup, produces embeddings)
+    """
     try:
-        # Try a simple embedding to verify model is loaded
-        response = ollama.embeddings(
-            model=EMBEDDING_MODEL,
-            prompt="test"
-        )
-        return len(response.get('embedding', [])) == EMBEDDING_DIM
+        # Model listing needs no inference, unlike a test embedding
+        models = ollama.list()['models']
+        if not any((m.get('model') or m.get('name', '')).startswith(EMBEDDING_MODEL) for m in models):
+            return False
+
+        if warmup:
+            return len(_embed_with_retry(["test"])[0]) == EMBEDDING_DIM
+        return True
     except Exception as e:
         logger.error(f"Embedding model check failed: {e}")
         return False
+
+
+def _embed_with_retry(texts: List[str]) -> List[np.ndarray]:
+    """Embed a list of texts in a single Ollama request, retrying on failure."""
+    # Truncate texts that are too long
+    texts = [text[:MAX_TEXT_CHARS] for text in texts]
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            response = ollama.embed(
+                model=EMBEDDING_MODEL,
+                input=texts
+            )
+            return [np.asarray(v, dtype=np.float32) for v in response['embeddings']]
+
+        except Exception as e:
+            logger.warning(f"Embedding attempt {attempt + 1} failed: {e}")
+            if attempt < MAX_RETRIES - 1:
+                time.sleep(RETRY_DELAY)
+            else:
+                raise RuntimeError(f"Failed to generate embedding after {MAX_RETRIES} attempts: {e}")
@@ -0,0 +1,68 @@
+"""In-process embedding generation using fastembed (ONNX Runtime)."""
+
+import logging
+import threading
+from typing import List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FASTEMBED_MODEL = "nomic-ai/nomic-embed-text-v1.5"
+FASTEMBED_BATCH_SIZE = 64  # Texts per ONNX forward pass
+
+_backend: Optional["FastEmbedBackend"] = None
+_backend_lock = threading.Lock()
+
+
+class FastEmbedBackend:
+    """Embeds texts in-process with fastembed, avoiding HTTP calls to Ollama."""
+
+    def __init__(self, model_name: str = FASTEMBED_MODEL, batch_size: int = FASTEMBED_BATCH_SIZE):
+        try:
+            from fastembed import TextEmbedding
+        except ImportError as e:
+            raise ImportError(
+                "EMBEDDING_BACKEND=fastembed requires the fastembed package: pip install fastembed"
+            ) from e
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = TextEmbedding(model_name)
+        logger.info(f"Loaded fastembed model {model_name}")
+
+    def embed(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Generate embeddings for a list of texts.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of numpy arrays, each of shape (768,)
+        """
+        return [
+            np.asarray(v, dtype=np.float32)
+            for v in self.model.embed(texts, batch_size=self.batch_size)
+        ]
+
+
+def get_fastembed_backend() -> FastEmbedBackend:
+    """Load the fastembed model once per process."""
+    global _backend
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = FastEmbedBackend()
+
+    return _backend
+
+
+def check_fastembed_model() -> bool:
+    """Check if the fastembed model can be loaded."""
+    try:
+        get_fastembed_backend()
+        return True
+    except Exception as e:
+        logger.error(f"fastembed model check failed: {e}")
+        return False
@@ -1,14 +1,29 @@
 """Vector store operations using PostgreSQL with pgvector."""
 
+import io
+import struct
 import logging
 from typing import List, Optional
 import numpy as np
-from ..database.db_setup import get_connection
+from psycopg2.extensions import connection as PgConnection, encodings as pg_encodings
+from psycopg2.extras import execute_values
+from ..database.db_setup import get_connection, invalidate_stats, prepare_statement
 
 logger = logging.getLogger(__name__)
 
+INSERT_PAGE_SIZE = 200  # Rows per multi-row INSERT statement
+COPY_MIN_CHUNKS = 16  # Use binary COPY for articles with at least this many chunks
+HNSW_EF_SEARCH = 40  # HNSW candidate list size at query time (recall vs. speed)
+RERANK_CANDIDATES = 100  # Hamming pre-filter results re-ranked with halfvec cosine
+RRF_K = 60  # Reciprocal rank fusion constant
 
-def insert_article(metadata: dict, full_text: str, pdf_path: str) -> int:
+
+def insert_article(
+    metadata: dict,
+    full_text: str,
+    pdf_path: str,
+    conn: Optional[PgConnection] = None
+) -> int:
     """
     Insert an article and return its ID.
 
@@ -16,11 +31,20 @@ def insert_article(metadata: dict, full_text: str, pdf_path: str) -> int:
         metadata: Dictionary with title, authors, journal, year
         full_text: Full extracted text
         pdf_path: Path to source PDF
+        conn: Connection whose open transaction the insert joins; the caller
+            commits and then calls invalidate_stats(). If omitted, a pooled
+            connection is used and committed.
 
     Returns:
         Article ID
     """
-    conn = get_connection()
+    if conn is None:
+        with get_connection() as conn:
+            article_id = insert_article(metadata, full_text, pdf_path, conn)
+            conn.commit()
+            invalidate_stats()
+            return article_id
+
     cur = conn.cursor()
 
     try:
@@ -38,20 +62,22 @@ def insert_article(metadata: dict, full_text: str, pdf_path: str) -> int:
         ))
 
         article_id = cur.fetchone()[0]
-        conn.commit()
         logger.info(f"Inserted article {article_id}: {metadata.get('title', 'Unknown')[:50]}")
         return article_id
 
     except Exception as e:
-        conn.rollback()
         logger.error(f"Failed to insert article: {e}")
         raise
     finally:
         cur.close()
-        conn.close()
 
 
-def insert_chunks(article_id: int, chunks: List[dict], embeddings: List[np.ndarray]) -> None:
+def insert_chunks(
+    article_id: int,
+    chunks: List[dict],
+    embeddings: List[np.ndarray],
+    conn: Optional[PgConnection] = None
+) -> None:
     """
     Insert chunks with embeddings for an article.
 
@@ -59,44 +85,74 @@ def insert_chunks(article_id: int, chunks: List[dict], embeddings: List[np.ndarr
         article_id: ID of the parent article
         chunks: List of chunk dictionaries
         embeddings: List of embedding arrays
+        conn: Connection whose open transaction the insert joins; the caller
+            commits and then calls invalidate_stats(). If omitted, a pooled
+            connection is used and committed.
     """
     if len(chunks) != len(embeddings):
         raise ValueError("Chunks and embeddings must have same length")
 
-    conn = get_connection()
+    if conn is None:
+        with get_connection() as conn:
+            insert_chunks(article_id, chunks, embeddings, conn)
+            conn.commit()
+            invalidate_stats()
+            return
+
+    # Store unit-length vectors so search can use the cheaper inner product
+    embeddings = _l2_normalize(np.asarray(embeddings, dtype=np.float32))
+
     cur = conn.cursor()
 
     try:
-        for chunk, embedding in zip(chunks, embeddings):
-            # Convert numpy array to list for pgvector
-            embedding_list = embedding.tolist()
+        if len(chunks) >= COPY_MIN_CHUNKS:
+            # Stream large articles with binary COPY
+            buffer = _to_copy_binary(
+                article_id, chunks, embeddings, pg_encodings[conn.encoding]
+            )
+            cur.copy_expert(
+                "COPY chunks (article_id, chunk_text, chunk_index, embedding) "
+                "FROM STDIN WITH (FORMAT BINARY)",
+                buffer
+            )
+        else:
+            # Embeddings are passed as numpy arrays via the pgvector adapter
+            rows = [
+                (
+                    article_id,
+                    chunk['chunk_text'],
+                    chunk['chunk_index'],
+                    embedding
+                )
+                for chunk, embedding in zip(chunks, embeddings)
+            ]
+
+            # Send all chunks as multi-row INSERTs instead of one round-trip per chunk
+            execute_values(
+                cur,
+                "INSERT INTO chunks (article_id, chunk_text, chunk_index, embedding) VALUES %s",
+                rows,
+                template="(%s, %s, %s, %s::halfvec)",
+                page_size=INSERT_PAGE_SIZE
+            )
 
-            cur.execute("""
-                INSERT INTO chunks (article_id, chunk_text, chunk_index, embedding)
-                VALUES (%s, %s, %s, %s);
-            """, (
-                article_id,
-                chunk['chunk_text'],
-                chunk['chunk_index'],
-                embedding_list
-            ))
-
-        conn.commit()
         logger.info(f"Inserted {len(chunks)} chunks for article {article_id}")
 
     except Exception as e:
-        conn.rollback()
         logger.error(f"Failed to insert chunks: {e}")
         raise
     finally:
         cur.close()
-        conn.close()
 
 
 def similarity_search(query_embedding: np.ndarray, top_k: int = 5) -> List[dict]:
     """
     Search for similar chunks using cosine similarity.
 
+    Candidates are pre-filtered by Hamming distance on the binary quantized
+    embeddings, then re-ranked by inner product, which equals cosine
+    similarity for the unit-length vectors stored by insert_chunks.
+
     Args:
         query_embedding: Query embedding vector
         top_k: Number of results to return
@@ -104,80 +160,231 @@ def similarity_search(query_embedding: np.ndarray, top_k: int = 5) -> List[dict]
     Returns:
         List of dictionaries with chunk info and similarity scores
     """
-    conn = get_connection()
-    cur = conn.cursor()
+    candidates = max(RERANK_CANDIDATES, top_k)
+    query_embedding = _l2_normalize(query_embedding)
+
+    with get_connection() as conn:
+        cur = conn.cursor()
+
+        try:
+            # HNSW returns at most ef_search rows, so it must cover the candidate pool.
+            # Scoped to this transaction so pooled connections keep the default
+            cur.execute("SET LOCAL hnsw.ef_search = %s;", (max(HNSW_EF_SEARCH, candidates),))
+
+            # Parsed and planned once per pooled connection
+            prepare_statement(conn, "similarity_search", """
+                WITH candidates AS (
+                    SELECT id
+                    FROM chunks
+                    ORDER BY embedding_bin <~> binary_quantize($1::halfvec)
+                    LIMIT $2
+                )
+                SELECT
+                    c.id,
+                    c.chunk_text,
+                    c.chunk_index,
+                    c.article_id,
+                    a.title,
+                    a.authors,
+                    a.year,
+                    -(c.embedding <#> $1::halfvec) as similarity
+                FROM candidates
+                JOIN chunks c ON c.id = candidates.id
+                JOIN articles a ON c.article_id = a.id
+                ORDER BY c.embedding <#> $1::halfvec
+                LIMIT $3
+            """)
+            cur.execute(
+                "EXECUTE similarity_search (%s::halfvec, %s, %s);",
+                (query_embedding, candidates, top_k)
+            )
+
+            results = []
+            for row in cur.fetchall():
+                results.append({
+                    'chunk_id': row[0],
+                    'chunk_text': row[1],
+                    'chunk_index': row[2],
+                    'article_id': row[3],
+                    'title': row[4],
+                    'authors': row[5],
+                    'year': row[6],
+                    'similarity': float(row[7])
+                })
+
+            return results
+
+        finally:
+            cur.close()
+
+
+def hybrid_search(query_text: str, query_embedding: np.ndarray, top_k: int = 5) -> List[dict]:
+    """
+    Search chunks with vector and full-text ranking fused inside Postgres.
 
-    try:
-        embedding_list = query_embedding.tolist()
+    Both candidate lists are ranked by the database and combined with
+    reciprocal rank fusion, so the chunk corpus never leaves the server.
 
-        cur.execute("""
-            SELECT
-                c.id,
-                c.chunk_text,
-                c.chunk_index,
-                c.article_id,
-                a.title,
-                a.authors,
-                a.year,
-                1 - (c.embedding <=> %s::vector) as similarity
-            FROM chunks c
-            JOIN articles a ON c.article_id = a.id
-            ORDER BY c.embedding <=> %s::vector
-            LIMIT %s;
-        """, (embedding_list, embedding_list, top_k))
-
-        results = []
-        for row in cur.fetchall():
-            results.append({
-                'chunk_id': row[0],
-                'chunk_text': row[1],
-                'chunk_index': row[2],
-                'article_id': row[3],
-                'title': row[4],
-                'authors': row[5],
-                'year': row[6],
-                'similarity': float(row[7])
+    Args:
+        query_text: Raw query text for full-text matching
+        query_embedding: Query embedding vector
+        top_k: Number of results to return
+
+    Returns:
+        List of dictionaries with chunk info and fused scores
+    """
+    query_embedding = _l2_normalize(query_embedding)
+
+    with get_connection() as conn:
+        cur = conn.cursor()
+
+        try:
+            cur.execute("SET LOCAL hnsw.ef_search = %s;", (HNSW_EF_SEARCH,))
+
+            cur.execute("""
+                WITH vec AS (
+                    SELECT id, ROW_NUMBER() OVER (ORDER BY distance) AS rank
+                    FROM (
+                        SELECT id, embedding <#> %(embedding)s::halfvec AS distance
+                        FROM chunks
+                        ORDER BY distance
+                        LIMIT %(candidates)s
+                    ) v
+                ),
+                kw AS (
+                    SELECT id, ROW_NUMBER() OVER (ORDER BY score DESC) AS rank
+                    FROM (
+                        SELECT id, ts_rank_cd(ts, query) AS score
+                        FROM chunks, plainto_tsquery('english', %(query)s) query
+                        WHERE ts @@ query
+                        ORDER BY score DESC
+                        LIMIT %(candidates)s
+                    ) k
+                ),
+                fused AS (
+                    SELECT
+                        COALESCE(vec.id, kw.id) AS id,
+                        COALESCE(1.0 / (%(rrf_k)s + vec.rank), 0.0) AS vector_score,
+                        COALESCE(1.0 / (%(rrf_k)s + kw.rank), 0.0) AS keyword_score
+                    FROM vec
+                    FULL OUTER JOIN kw ON vec.id = kw.id
+                )
+                SELECT
+                    c.id,
+                    c.chunk_text,
+                    c.chunk_index,
+                    c.article_id,
+                    a.title,
+                    a.authors,
+                    a.year,
+                    f.vector_score,
+                    f.keyword_score,
+                    f.vector_score + f.keyword_score AS fused_score
+                FROM fused f
+                JOIN chunks c ON c.id = f.id
+                JOIN articles a ON c.article_id = a.id
+                ORDER BY fused_score DESC
+                LIMIT %(top_k)s;
+            """, {
+                'embedding': query_embedding,
+                'query': query_text,
+                'candidates': top_k * 2,
+                'rrf_k': RRF_K,
+                'top_k': top_k
             })
 
-        return results
+            results = []
+            for row in cur.fetchall():
+                results.append({
+                    'chunk_id': row[0],
+                    'chunk_text': row[1],
+                    'chunk_index': row[2],
+                    'article_id': row[3],
+                    'title': row[4],
+                    'authors': row[5],
+                    'year': row[6],
+                    'vector_score': float(row[7]),
+                    'bm25_score': float(row[8]),
+                    'fused_score': float(row[9])
+                })
 
-    finally:
-        cur.close()
-        conn.close()
+            return results
 
+        finally:
+            cur.close()
 
-def get_all_chunks() -> List[dict]:
-    """Get all chunks for BM25 indexing."""
-    conn = get_connection()
-    cur = conn.cursor()
 
-    try:
-        cur.execute("""
-            SELECT
-                c.id,
-                c.chunk_text,
-                c.article_id,
-                a.title,
-                a.authors,
-                a.year
-            FROM chunks c
-            JOIN articles a ON c.article_id = a.id
-            ORDER BY c.id;
-        """)
-
-        results = []
-        for row in cur.fetchall():
-            results.append({
-                'chunk_id': row[0],
-                'chunk_text': row[1],
-                'article_id': row[2],
-                'title': row[3],
-                'authors': row[4],
-                'year': row[5]
-            })
+def get_all_chunks() -> List[dict]:
+    """
+    Get all chunks for BM25 indexing.
 
-        return results
+    Deprecated: hybrid_search() ranks keywords inside Postgres without
+    loading the corpus into Python. Kept for the in-process BM25 index.
+    """
+    with get_connection() as conn:
+        cur = conn.cursor()
 
-    finally:
-        cur.close()
-        conn.close()
+        try:
+            cur.execute("""
+                SELECT
+                    c.id,
+                    c.chunk_text,
+                    c.article_id,
+                    a.title,
+                    a.authors,
+                    a.year
+                FROM chunks c
+                JOIN articles a ON c.article_id = a.id
+                ORDER BY c.id;
+            """)
+
+            results = []
+            for row in cur.fetchall():
+                results.append({
+                    'chunk_id': row[0],
+                    'chunk_text': row[1],
+                    'article_id': row[2],
+                    'title': row[3],
+                    'authors': row[4],
+                    'year': row[5]
+                })
+
+            return results
+
+        finally:
+            cur.close()
+
+
+def _l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale vectors to unit length along the last axis (zero vectors are left as is)."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _to_copy_binary(
+    article_id: int,
+    chunks: List[dict],
+    embeddings: List[np.ndarray],
+    encoding: str
+) -> io.BytesIO:
+    """Build a PostgreSQL binary COPY stream for chunk rows."""
+    buffer = io.BytesIO()
+
+    # Signature, flags and header extension length
+    buffer.write(b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0))
+
+    for chunk, embedding in zip(chunks, embeddings):
+        text = chunk['chunk_text'].encode(encoding)
+        # halfvec wire format: int16 dim, int16 unused, big-endian fp16 values
+        vector = struct.pack('>hh', len(embedding), 0) + np.asarray(embedding, dtype='>f2').tobytes()
+
+        buffer.write(struct.pack('>h', 4))
+        buffer.write(struct.pack('>ii', 4, article_id))
+        buffer.write(struct.pack('>i', len(text)) + text)
+        buffer.write(struct.pack('>ii', 4, chunk['chunk_index']))
+        buffer.write(struct.pack('>i', len(vector)) + vector)
+
+    # File trailer
+    buffer.write(struct.pack('>h', -1))
+    buffer.seek(0)
+    return buffer
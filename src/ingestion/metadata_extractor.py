@@ -2,10 +2,42 @@
 
 import re
 import logging
-from typing import Optional
+from collections import Counter
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Common author patterns in academic papers, one named group each
+_AUTHOR_SOURCES = [
+    # "John Smith, Jane Doe, Bob Wilson"
+    r'^(?P<names>[A-Z][a-z]+\s+[A-Z][a-z]+(?:\s*,\s*[A-Z][a-z]+\s+[A-Z][a-z]+)+)',
+    # "J. Smith, J. Doe"
+    r'^(?P<initials>[A-Z]\.\s*[A-Z][a-z]+(?:\s*,\s*[A-Z]\.\s*[A-Z][a-z]+)+)',
+    # Author section
+    r'Authors?:\s*(?P<section>.+?)(?:\n|$)',
+]
+_AUTHOR_PATTERNS = tuple(re.compile(source, re.IGNORECASE) for source in _AUTHOR_SOURCES)
+
+# All author patterns in one scan; alternatives are tried in the order above
+_AUTHOR_RE = re.compile('|'.join(f'(?:{source})' for source in _AUTHOR_SOURCES), re.IGNORECASE)
+
+# Common journal name patterns
+_JOURNAL_PATTERNS = [
+    re.compile(r'(?:Published in|Journal[:\s]+)([A-Z][^,\n]+)'),
+    re.compile(r'([A-Z][a-z]+\s+(?:Journal|Review|Letters|Medicine|Research|Science)[^,\n]*)'),
+]
+
+# Words marking header/footer lines that are not titles
+_TITLE_SKIP_RE = re.compile(r'abstract|introduction|doi:|volume|issue')
+
+# 4-digit year in reasonable range
+_YEAR_RE = re.compile(r'\b(20[0-2][0-9]|201[0-9])\b')
+
+# Header lines searched for each field
+TITLE_LINES = 20  # Usually largest/bold text comes first
+AUTHOR_LINES = 30
+HEADER_LINES = 50  # Journal and year
+
 
 def extract_metadata(filename: str, full_text: str) -> dict:
     """
@@ -18,105 +50,108 @@ def extract_metadata(filename: str, full_text: str) -> dict:
     Returns:
         Dictionary with title, authors, journal, year
     """
+    # Split only as far as the header lines that are searched
+    lines = full_text.split('\n', HEADER_LINES)[:HEADER_LINES]
+    header = _scan_header_lines(lines)
+
     metadata = {
-        "title": _extract_title(filename, full_text),
-        "authors": _extract_authors(full_text),
-        "journal": _extract_journal(full_text),
-        "year": _extract_year(filename, full_text)
+        "title": header['title'] or _title_from_filename(filename),
+        "authors": header['authors'],
+        "journal": header['journal'],
+        "year": _extract_year(filename, lines)
     }
 
     logger.info(f"Extracted metadata for {filename}: title='{metadata['title'][:50]}...'")
     return metadata
 
 
-def _extract_title(filename: str, text: str) -> str:
-    """Extract title from text or filename."""
-    # Try to get title from first few lines (usually largest/bold text comes first)
-    lines = text.split('\n')[:20]
+def _scan_header_lines(lines: List[str]) -> dict:
+    """Find title, authors and journal in a single pass over the header lines."""
+    found = {'title': None, 'authors': None, 'journal': None}
 
-    # Look for a substantial line that could be a title (not too short, not too long)
-    for line in lines:
-        line = line.strip()
-        # Title is usually 10-200 chars, starts with capital, no common noise
-        if 10 < len(line) < 200 and line[0].isupper():
-            # Skip lines that look like headers/footers
-            if not any(skip in line.lower() for skip in ['abstract', 'introduction', 'doi:', 'volume', 'issue']):
-                return line
+    for i, line in enumerate(lines):
+        if found['title'] is None and i < TITLE_LINES:
+            found['title'] = _match_title(line)
 
-    # Fallback to filename (remove extension, replace underscores)
-    title = filename.replace('.pdf', '').replace('_', ' ').replace('-', ' ')
-    return title.strip()
+        if found['authors'] is None and i < AUTHOR_LINES:
+            found['authors'] = _match_authors(line)
 
+        if found['journal'] is None:
+            found['journal'] = _match_journal(line)
 
-def _extract_authors(text: str) -> Optional[str]:
-    """Extract author names from text."""
-    # Common author patterns in academic papers
-    patterns = [
-        # "John Smith, Jane Doe, Bob Wilson"
-        r'^([A-Z][a-z]+\s+[A-Z][a-z]+(?:\s*,\s*[A-Z][a-z]+\s+[A-Z][a-z]+)+)',
-        # "J. Smith, J. Doe"
-        r'^([A-Z]\.\s*[A-Z][a-z]+(?:\s*,\s*[A-Z]\.\s*[A-Z][a-z]+)+)',
-        # Author section
-        r'Authors?:\s*(.+?)(?:\n|$)',
-    ]
-
-    lines = text.split('\n')[:30]  # Authors usually in first 30 lines
-
-    for line in lines:
-        for pattern in patterns:
-            match = re.search(pattern, line, re.IGNORECASE)
-            if match:
-                authors = match.group(1).strip()
-                # Clean up and limit length
-                if len(authors) > 10 and len(authors) < 500:
-                    return authors
+        # Stop as soon as every field is filled
+        if all(found.values()):
+            break
 
-    return None
+    return found
 
 
-def _extract_journal(text: str) -> Optional[str]:
-    """Extract journal name from text."""
-    # Common journal name patterns
-    patterns = [
-        r'(?:Published in|Journal[:\s]+)([A-Z][^,\n]+)',
-        r'([A-Z][a-z]+\s+(?:Journal|Review|Letters|Medicine|Research|Science)[^,\n]*)',
-    ]
+def _match_title(line: str) -> Optional[str]:
+    """Return the line if it looks like a title."""
+    line = line.strip()
+    # Title is usually 10-200 chars, starts with capital, no common noise
+    if 10 < len(line) < 200 and line[0].isupper():
+        # Skip lines that look like headers/footers
+        if not _TITLE_SKIP_RE.search(line.lower()):
+            return line
+    return None
+
 
-    lines = text.split('\n')[:50]
+def _title_from_filename(filename: str) -> str:
+    """Fallback title from filename (remove extension, replace underscores)."""
+    title = filename.replace('.pdf', '').replace('_', ' ').replace('-', ' ')
+    return title.strip()
 
-    for line in lines:
-        for pattern in patterns:
-            match = re.search(pattern, line)
-            if match:
-                journal = match.group(1).strip()
-                if 5 < len(journal) < 200:
-                    return journal
 
+def _match_authors(line: str) -> Optional[str]:
+    """Return author names if the line matches a common author pattern."""
+    match = _AUTHOR_RE.search(line)
+    if match is None:
+        return None
+
+    authors = match.group(match.lastgroup).strip()
+    if 10 < len(authors) < 500:
+        return authors
+
+    # Rare: the first matching pattern was rejected by length, so a later one may
+    # still apply. Each pattern has one group, so lastindex is its 1-based position
+    for pattern in _AUTHOR_PATTERNS[match.lastindex:]:
+        match = pattern.search(line)
+        if match:
+            authors = match.group(1).strip()
+            # Clean up and limit length
+            if len(authors) > 10 and len(authors) < 500:
+                return authors
     return None
 
 
-def _extract_year(filename: str, text: str) -> Optional[int]:
-    """Extract publication year from filename or text."""
-    # Look for 4-digit year in reasonable range
-    year_pattern = r'\b(20[0-2][0-9]|201[0-9])\b'
+def _match_journal(line: str) -> Optional[str]:
+    """Return a journal name if the line matches a common journal pattern."""
+    for pattern in _JOURNAL_PATTERNS:
+        match = pattern.search(line)
+        if match:
+            journal = match.group(1).strip()
+            if 5 < len(journal) < 200:
+                return journal
+    return None
+
 
+def _extract_year(filename: str, lines: List[str]) -> Optional[int]:
+    """Extract publication year from filename or header lines."""
     # Try filename first
-    match = re.search(year_pattern, filename)
+    match = _YEAR_RE.search(filename)
     if match:
         return int(match.group(1))
 
-    # Then first 50 lines of text
-    lines = text.split('\n')[:50]
+    # Then the header lines of the text
     text_sample = '\n'.join(lines)
 
-    matches = re.findall(year_pattern, text_sample)
+    matches = _YEAR_RE.findall(text_sample)
     if matches:
         # Return the most common year, preferring recent ones
         years = [int(y) for y in matches]
         # Prefer years 2015-2025
         recent_years = [y for y in years if 2015 <= y <= 2025]
-        if recent_years:
-            return max(set(recent_years), key=recent_years.count)
-        return max(set(years), key=years.count)
+        return Counter(recent_years or years).most_common(1)[0][0]
 
     return None
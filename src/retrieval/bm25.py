@@ -1,20 +1,60 @@
 """BM25 keyword search implementation."""
 
+import os
 import re
+import pickle
+import hashlib
 import logging
-from typing import List, Optional
-from rank_bm25 import BM25Okapi
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r'\b[a-z0-9]+\b')
+
+# Common words dropped from the index
+_STOPWORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
+    'for', 'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were',
+    'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should', 'may', 'might', 'must',
+    'this', 'that', 'these', 'those', 'it', 'its'
+})
+
+PARALLEL_TOKENIZE_MIN = 500  # Smaller corpora are tokenized serially (pool startup dominates)
+QUERY_TOKEN_CACHE_SIZE = 1024  # Tokenized queries kept in memory
+
+# Okapi BM25 parameters (same defaults as rank_bm25.BM25Okapi)
+BM25_K1 = 1.5  # Term frequency saturation
+BM25_B = 0.75  # Document length normalization
+BM25_EPSILON = 0.25  # Floor for negative idf, as a fraction of the average idf
+
+# Built indexes are cached here, keyed by corpus contents (empty string disables)
+BM25_CACHE_DIR = os.getenv(
+    "BM25_CACHE_DIR", str(Path(__file__).resolve().parents[2] / "data" / "cache")
+)
+CACHE_VERSION = 6  # Bump when tokenization or weighting changes
+
+# BM25Index attributes stored in the cache
+_CACHED_FIELDS = ('vocab', 'idf', 'tf_csc')
+
 
 class BM25Index:
     """BM25 index for keyword-based retrieval."""
 
-    def __init__(self):
-        self.index: Optional[BM25Okapi] = None
+    __slots__ = ('cache_dir', 'vocab', 'idf', 'tf_csc', 'chunks')
+
+    def __init__(self, cache_dir: str = BM25_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.vocab: Dict[str, int] = {}  # Term -> column id
+        self.idf: np.ndarray = np.empty(0, dtype=np.float32)  # Indexed by column id
+        self.tf_csc: Optional[csc_matrix] = None  # Saturated term frequency (docs x terms)
         self.chunks: List[dict] = []
-        self.tokenized_corpus: List[List[str]] = []
 
     def build_index(self, chunks: List[dict]) -> None:
         """
@@ -24,12 +64,28 @@ class BM25Index:
             chunks: List of chunk dictionaries with chunk_text
         """
         self.chunks = chunks
-        self.tokenized_corpus = [
-            self._tokenize(chunk['chunk_text'])
-            for chunk in chunks
-        ]
-
-        self.index = BM25Okapi(self.tokenized_corpus)
+        texts = [chunk['chunk_text'] for chunk in chunks]
+
+        cache_key = _corpus_hash(chunks)
+        if self._load_cache(cache_key):
+            logger.info(f"Loaded BM25 index with {len(chunks)} documents from cache")
+            return
+
+        workers = os.cpu_count() or 1
+
+        # A pool only pays off with several CPUs and enough text to split
+        if workers < 2 or len(texts) < PARALLEL_TOKENIZE_MIN:
+            tokenized_corpus = [_tokenize(text) for text in texts]
+        else:
+            # Tokenization is pure-Python CPU work, so spread it over processes
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                tokenized_corpus = list(executor.map(
+                    _tokenize, texts, chunksize=max(1, len(texts) // (workers * 4))
+                ))
+
+        # Only the statistics are kept; the token lists are dropped after this
+        self._compute_statistics(tokenized_corpus)
+        self._save_cache(cache_key)
         logger.info(f"Built BM25 index with {len(chunks)} documents")
 
     def search(self, query: str, top_k: int = 10) -> List[dict]:
@@ -43,47 +99,155 @@ class BM25Index:
         Returns:
             List of chunks with BM25 scores
         """
-        if self.index is None:
+        if self.tf_csc is None:
             logger.warning("BM25 index not built")
             return []
 
-        tokenized_query = self._tokenize(query)
-        scores = self.index.get_scores(tokenized_query)
+        # Repeated queries reuse their tokens
+        tokenized_query = _tokenize_cached(query)
+
+        # Map query terms to column ids in one pass, dropping unknown terms
+        term_ids = np.fromiter(
+            (self.vocab.get(token, -1) for token in tokenized_query),
+            dtype=np.int64,
+            count=len(tokenized_query)
+        )
+        term_ids = term_ids[term_ids >= 0]
+        if term_ids.size == 0:
+            return []
 
-        # Get top-k indices
-        top_indices = sorted(
-            range(len(scores)),
-            key=lambda i: scores[i],
-            reverse=True
-        )[:top_k]
+        # Only the query's columns are read; a repeated term contributes once per
+        # occurrence (float32 halves the memory traffic of scoring and top-k)
+        scores = self.tf_csc[:, term_ids] @ self.idf[term_ids]
+
+        # Select the top-k without sorting the whole corpus, then order just those
+        k = min(top_k, scores.size)
+        if k <= 0:
+            return []
+        top_indices = np.argpartition(scores, -k)[-k:]
+        top_indices = top_indices[np.argsort(scores[top_indices])[::-1]]
 
         results = []
         for idx in top_indices:
             if scores[idx] > 0:  # Only include non-zero scores
-                chunk = self.chunks[idx].copy()
-                chunk['bm25_score'] = float(scores[idx])
-                results.append(chunk)
+                results.append({**self.chunks[idx], 'bm25_score': float(scores[idx])})
 
         return results
 
-    def _tokenize(self, text: str) -> List[str]:
-        """Simple tokenization for BM25."""
-        # Lowercase and split on non-alphanumeric
-        text = text.lower()
-        tokens = re.findall(r'\b[a-z0-9]+\b', text)
+    def _compute_statistics(self, tokenized_corpus: List[List[str]]) -> None:
+        """
+        Precompute the corpus statistics used by Okapi BM25 scoring.
 
-        # Remove very short tokens and stopwords
-        stopwords = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
-            'for', 'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were',
-            'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
-            'will', 'would', 'could', 'should', 'may', 'might', 'must',
-            'this', 'that', 'these', 'those', 'it', 'its'
-        }
+        Matches rank_bm25.BM25Okapi, including its idf floor for terms that
+        appear in more than half of the documents. The score of a document is
+        tf_csc[doc] @ (query term counts * idf). The matrix is stored by
+        column so a query reads only the columns of its own terms.
 
-        tokens = [t for t in tokens if len(t) > 2 and t not in stopwords]
-        return tokens
+        Args:
+            tokenized_corpus: Token list for each document
+        """
+        vocab: Dict[str, int] = {}
+        indptr = [0]
+        indices = []
+        counts = []
+
+        for tokens in tokenized_corpus:
+            for term, count in Counter(tokens).items():
+                indices.append(vocab.setdefault(term, len(vocab)))
+                counts.append(count)
+            indptr.append(len(indices))
+
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        tf = np.asarray(counts, dtype=np.float64)
+
+        n_docs = len(tokenized_corpus)
+        doc_len = np.array([len(tokens) for tokens in tokenized_corpus], dtype=np.float64)
+        avgdl = doc_len.mean() if n_docs else 0.0
+
+        # idf = log((N - n + 0.5) / (n + 0.5)); negative values get a small positive floor
+        doc_freq = np.bincount(indices, minlength=len(vocab))
+        idf = np.log(n_docs - doc_freq + 0.5) - np.log(doc_freq + 0.5)
+        if idf.size:
+            idf[idf < 0] = BM25_EPSILON * idf.mean()
+
+        # Saturated term frequency, normalized by each entry's document length
+        entry_doc_len = np.repeat(doc_len, np.diff(indptr))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * entry_doc_len / (avgdl or 1.0))
+        saturated = (tf * (BM25_K1 + 1) / (tf + norm)).astype(np.float32)
+
+        self.vocab = vocab
+        self.idf = idf.astype(np.float32)
+        self.tf_csc = csr_matrix((saturated, indices, indptr), shape=(n_docs, len(vocab))).tocsc()
+
+    def _load_cache(self, cache_key: str) -> bool:
+        """Restore a previously built index for this corpus; returns False on a miss."""
+        if not self.cache_dir:
+            return False
+
+        cache_path = Path(self.cache_dir) / f"bm25_cache_{cache_key}.pkl"
+        if not cache_path.exists():
+            return False
+
+        try:
+            with open(cache_path, 'rb') as f:
+                state = pickle.load(f)
+            for field in _CACHED_FIELDS:
+                setattr(self, field, state[field])
+            return True
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable BM25 cache {cache_path}: {e}")
+            return False
+
+    def _save_cache(self, cache_key: str) -> None:
+        """Write the built index to the cache directory, replacing older entries."""
+        if not self.cache_dir:
+            return
+
+        cache_dir = Path(self.cache_dir)
+        cache_path = cache_dir / f"bm25_cache_{cache_key}.pkl"
+        state = {field: getattr(self, field) for field in _CACHED_FIELDS}
+
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # Only the current corpus is worth keeping
+            for stale in cache_dir.glob("bm25_cache_*.pkl"):
+                stale.unlink()
+
+            # Write then rename so a crash never leaves a truncated cache file
+            tmp_path = cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write BM25 cache {cache_path}: {e}")
 
     def is_ready(self) -> bool:
         """Check if index is built and ready."""
-        return self.index is not None and len(self.chunks) > 0
+        return self.tf_csc is not None and len(self.chunks) > 0
+
+
+def _tokenize(text: str) -> List[str]:
+    """Simple tokenization for BM25 (module-level so worker processes can unpickle it)."""
+    # Lowercase and split on non-alphanumeric, then remove very short tokens and stopwords
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 2 and t not in _STOPWORDS]
+
+
+@lru_cache(maxsize=QUERY_TOKEN_CACHE_SIZE)
+def _tokenize_cached(text: str) -> Tuple[str, ...]:
+    """Tokenize a query; cached as an immutable tuple shared between callers."""
+    return tuple(_tokenize(text))
+
+
+def _corpus_hash(chunks: List[dict]) -> str:
+    """Hash chunk ids and texts (ids alone repeat after a reindex) plus index settings."""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr((CACHE_VERSION, BM25_K1, BM25_B, BM25_EPSILON)).encode())
+
+    for chunk in chunks:
+        hasher.update(f"{chunk['chunk_id']}\0".encode())
+        hasher.update(chunk['chunk_text'].encode())
+        hasher.update(b'\0')
+
+    return hasher.hexdigest()
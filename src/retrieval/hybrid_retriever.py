@@ -1,11 +1,15 @@
 """Hybrid retriever combining BM25 and vector search."""
 
+import os
+import heapq
 import time
 import logging
+from functools import lru_cache
 from typing import List, Tuple
+import numpy as np
 from .bm25 import BM25Index
-from ..indexing.embeddings import get_embedding
-from ..indexing.vector_store import similarity_search, get_all_chunks
+from ..indexing.embeddings import EMBEDDING_MODEL, get_embedding
+from ..indexing.vector_store import similarity_search, hybrid_search, get_all_chunks
 
 logger = logging.getLogger(__name__)
 
@@ -13,16 +17,30 @@ logger = logging.getLogger(__name__)
 BM25_WEIGHT = 0.3
 VECTOR_WEIGHT = 0.7
 
+# Run keyword + vector ranking and fusion inside Postgres instead of in Python
+SERVER_SIDE_HYBRID = os.getenv("SERVER_SIDE_HYBRID", "false").lower() in ("1", "true", "yes")
+
+QUERY_EMBEDDING_CACHE_SIZE = 1024  # Query embeddings kept in memory
+
 
 class HybridRetriever:
     """Hybrid retrieval combining keyword (BM25) and semantic (vector) search."""
 
-    def __init__(self):
+    __slots__ = ('bm25_index', 'server_side', '_initialized')
+
+    def __init__(self, server_side: bool = SERVER_SIDE_HYBRID):
         self.bm25_index = BM25Index()
+        self.server_side = server_side
         self._initialized = False
 
     def initialize(self) -> None:
         """Initialize retriever by loading chunks and building BM25 index."""
+        if self.server_side:
+            # Nothing to load: keyword search uses the chunks.ts GIN index
+            self._initialized = True
+            logger.info("Hybrid retriever initialized with server-side fusion")
+            return
+
         chunks = get_all_chunks()
 
         if not chunks:
@@ -49,8 +67,14 @@ class HybridRetriever:
         if not self._initialized:
             self.initialize()
 
+        # Repeated queries skip the embedding model entirely
+        query_embedding = _embed_query(EMBEDDING_MODEL, _normalize_query(query))
+
+        if self.server_side:
+            results = hybrid_search(query, query_embedding, top_k=top_k)
+            return results, time.time() - start_time
+
         # Get vector search results
-        query_embedding = get_embedding(query)
         vector_results = similarity_search(query_embedding, top_k=top_k * 2)
 
         # Get BM25 search results
@@ -78,65 +102,78 @@ class HybridRetriever:
             [r.get('bm25_score', 0) for r in bm25_results]
         )
 
-        # Create score maps by chunk_id
+        # Create score maps by chunk_id in one pass over each result list
         score_map = {}
 
-        for i, result in enumerate(vector_results):
-            chunk_id = result['chunk_id']
-            score_map[chunk_id] = {
+        for result, score in zip(vector_results, vector_scores):
+            score_map[result['chunk_id']] = {
                 'data': result,
-                'vector_score': vector_scores[i] if i < len(vector_scores) else 0,
+                'vector_score': score,
                 'bm25_score': 0
             }
 
-        for i, result in enumerate(bm25_results):
-            chunk_id = result['chunk_id']
-            if chunk_id in score_map:
-                score_map[chunk_id]['bm25_score'] = bm25_scores[i] if i < len(bm25_scores) else 0
-            else:
-                score_map[chunk_id] = {
-                    'data': result,
-                    'vector_score': 0,
-                    'bm25_score': bm25_scores[i] if i < len(bm25_scores) else 0
-                }
+        for result, score in zip(bm25_results, bm25_scores):
+            scores = score_map.setdefault(result['chunk_id'], {
+                'data': result,
+                'vector_score': 0,
+                'bm25_score': 0
+            })
+            scores['bm25_score'] = score
 
         # Calculate fused scores
-        for chunk_id, scores in score_map.items():
+        for scores in score_map.values():
             scores['fused_score'] = (
                 VECTOR_WEIGHT * scores['vector_score'] +
                 BM25_WEIGHT * scores['bm25_score']
             )
 
-        # Sort by fused score and return top_k
-        sorted_items = sorted(
+        # Keep the top_k by fused score without sorting every candidate
+        top_items = heapq.nlargest(
+            top_k,
             score_map.items(),
-            key=lambda x: x[1]['fused_score'],
-            reverse=True
-        )[:top_k]
-
-        results = []
-        for chunk_id, scores in sorted_items:
-            result = scores['data'].copy()
-            result['fused_score'] = scores['fused_score']
-            result['vector_score'] = scores['vector_score']
-            result['bm25_score'] = scores['bm25_score']
-            results.append(result)
+            key=lambda x: x[1]['fused_score']
+        )
 
-        return results
+        return [
+            {
+                **scores['data'],
+                'fused_score': float(scores['fused_score']),
+                'vector_score': float(scores['vector_score']),
+                'bm25_score': float(scores['bm25_score'])
+            }
+            for chunk_id, scores in top_items
+        ]
 
-    def _normalize_scores(self, scores: List[float]) -> List[float]:
+    def _normalize_scores(self, scores: List[float]) -> np.ndarray:
         """Normalize scores to 0-1 range."""
-        if not scores:
-            return []
+        scores = np.asarray(scores, dtype=np.float64)
+        if scores.size == 0:
+            return scores
 
-        min_score = min(scores)
-        max_score = max(scores)
+        min_score = scores.min()
+        max_score = scores.max()
 
         if max_score == min_score:
-            return [1.0] * len(scores)
+            return np.ones_like(scores)
 
-        return [(s - min_score) / (max_score - min_score) for s in scores]
+        return (scores - min_score) / (max_score - min_score)
 
     def is_ready(self) -> bool:
         """Check if retriever is ready."""
+        if self.server_side:
+            return self._initialized
         return self._initialized and self.bm25_index.is_ready()
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize case and whitespace so equivalent queries share a cache entry."""
+    return ' '.join(query.lower().split())
+
+
+@lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+def _embed_query(model: str, query: str) -> np.ndarray:
+    """Embed a normalized query; cached per (model, query)."""
+    embedding = get_embedding(query)
+    # Cached arrays are shared between callers
+    embedding.setflags(write=False)
+    return embedding